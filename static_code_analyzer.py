@@ -1,18 +1,22 @@
 import os
 import re
+import string
 import sys
 import ast
 import io
+import mmap
 import tokenize
-from dataclasses import dataclass
-from typing import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterable, NamedTuple
 
 
 MAX_LINE_LENGTH = 79
+# Files at least this large are decoded straight from a memory map.
+MMAP_THRESHOLD = 64 * 1024
 
 
-@dataclass(frozen=True, order=True)
-class ReportItem:
+class ReportItem(NamedTuple):
     file_path: str
     line_number: int
     code: str
@@ -34,181 +38,312 @@ MESSAGES = {
     "S012": "Default argument value is mutable",
 }
 
-RE_TODO = re.compile(r"todo", re.IGNORECASE)
+# Messages of the line checks that never take format arguments.
+_STATIC_MESSAGES = {
+    code: MESSAGES[code] for code in ("S001", "S002", "S003", "S004", "S005", "S006")
+}
+
+_ASCII_UPPERCASE = frozenset(string.ascii_uppercase)
+_ASCII_LOWERCASE = frozenset(string.ascii_lowercase)
+# Translation table deleting every character allowed in a snake_case name;
+# whatever survives the translation is a violation.
+_SNAKE_CASE_DELETE = dict.fromkeys(
+    map(ord, string.ascii_lowercase + string.digits + "_")
+)
 
 # Assumptions from the task: class/def are on one line like "class Name:" or "class Name(Base):"
 RE_CLASS = re.compile(r"^(\s*)class(\s+)([A-Za-z_][A-Za-z0-9_]*)")
 RE_DEF = re.compile(r"^(\s*)def(\s+)([A-Za-z_][A-Za-z0-9_]*)")
 
 
-def split_code_and_comment(line: str) -> tuple[str, str, int]:
+def _find_comment_col(line: str) -> int | None:
     """
-    Returns (code_part, comment_part, comment_col).
-    comment_col is -1 when there is no real comment token on this line.
+    Returns the column of the first '#' that is not inside a string literal,
+    -1 when there is none, or None when the line ends inside an unterminated
+    string and the answer is ambiguous.
     """
+    if "#" not in line:
+        return -1
+
+    quote = ""  # active string delimiter: ', ", ''' or """
+    i = 0
+    n = len(line)
+    while i < n:
+        ch = line[i]
+        if quote:
+            if ch == "\\":
+                i += 2
+                continue
+            if line.startswith(quote, i):
+                i += len(quote)
+                quote = ""
+                continue
+        elif ch == "#":
+            return i
+        elif ch == "'" or ch == '"':
+            triple = ch * 3
+            quote = triple if line.startswith(triple, i) else ch
+            i += len(quote)
+            continue
+        i += 1
+
+    return None if quote else -1
+
+
+def _tokenize_comment_col(line: str) -> int:
     try:
-        tokens = tokenize.generate_tokens(io.StringIO(line).readline)
+        # Lines come without their newline; restore it so a trailing
+        # backslash still reads as a string continuation.
+        tokens = tokenize.generate_tokens(io.StringIO(line + "\n").readline)
         for token in tokens:
             if token.type == tokenize.COMMENT:
-                col = token.start[1]
-                return line[:col].rstrip("\n"), line[col:].rstrip("\n"), col
+                return token.start[1]
     except tokenize.TokenError:
         # Fallback for malformed lines: keep behavior tolerant.
         pass
-    return line.rstrip("\n"), "", -1
+    return -1
+
+
+def line_comment_col(line: str) -> int:
+    """
+    Returns the column of the comment on a single line, or -1 if there is none.
+    Used for lines the whole-file tokenizer could not reach.
+    """
+    col = _find_comment_col(line)
+    if col is None:
+        # Unterminated string: let the tokenizer decide, as it is lenient
+        # about stray quotes in ways a simple scan cannot mirror.
+        col = _tokenize_comment_col(line)
+    return col
+
+
+def scan_source(source: str) -> tuple[dict[int, int], set[int], int]:
+    """
+    Tokenizes the whole source once.
+    Returns (comment_col_by_line, string_line_set, scanned_upto):
+    comment columns keyed by line number, the lines that end inside a
+    multi-line string, and the last line the tokenizer reached. Lines after
+    scanned_upto (malformed source) have to be scanned one by one.
+    """
+    comment_col_by_line: dict[int, int] = {}
+    string_line_set: set[int] = set()
+    scanned_upto = 0
+
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            start_row = token.start[0]
+            end_row = token.end[0]
+            if token.type == tokenize.COMMENT:
+                comment_col_by_line.setdefault(start_row, token.start[1])
+            elif token.type == tokenize.STRING and end_row > start_row:
+                string_line_set.update(range(start_row, end_row))
+            scanned_upto = end_row
+    except (tokenize.TokenError, SyntaxError):
+        pass
 
+    return comment_col_by_line, string_line_set, scanned_upto
 
+
+@lru_cache(maxsize=4096)
 def is_camel_case(name: str) -> bool:
     # Minimal CamelCase check suitable for this project:
     # starts with uppercase, contains only letters/digits, no underscores.
-    return bool(re.fullmatch(r"[A-Z][a-zA-Z0-9]*", name))
+    return (
+        name[:1] in _ASCII_UPPERCASE
+        and name.isascii()
+        and name.isalnum()
+    )
 
 
+@lru_cache(maxsize=4096)
 def is_snake_case(name: str) -> bool:
     # Allow leading/trailing underscores, require snake_case core.
     # Examples allowed: __init__, _print, do_magic, __fun__
-    return bool(re.fullmatch(r"_*[a-z][a-z0-9_]*_*", name))
+    core = name.lstrip("_")
+    return (
+        core[:1] in _ASCII_LOWERCASE
+        and not core.translate(_SNAKE_CASE_DELETE)
+    )
 
 
-def check_s001(raw_line: str) -> str | None:
-    if len(raw_line.rstrip("\n")) > MAX_LINE_LENGTH:
-        return "S001"
-    return None
+def check_s001(lines: list[str]) -> set[int]:
+    """
+    Returns the numbers of all lines longer than MAX_LINE_LENGTH.
+    """
+    return {
+        line_number
+        for line_number, line in enumerate(lines, start=1)
+        if len(line) > MAX_LINE_LENGTH
+    }
 
 
-def check_s002(raw_line: str) -> str | None:
-    if not raw_line.strip():
-        return None
-    leading_spaces = len(raw_line) - len(raw_line.lstrip(" "))
-    if leading_spaces % 4 != 0:
-        return "S002"
-    return None
+def check_s002(lines: list[str]) -> set[int]:
+    """
+    Returns the numbers of all non-blank lines whose indentation is not a
+    multiple of four (``& 3`` is ``% 4`` for non-negative counts).
+    """
+    return {
+        line_number
+        for line_number, line in enumerate(lines, start=1)
+        if (len(line) - len(line.lstrip(" "))) & 3 and line.strip()
+    }
 
 
-def check_s003(code_part: str) -> str | None:
-    if code_part.rstrip().endswith(";"):
-        return "S003"
-    return None
+def check_s006(lines: list[str]) -> set[int]:
+    """
+    Returns the numbers of all non-blank lines preceded by more than two
+    blank lines.
+    """
+    result: set[int] = set()
+    blank_lines_before = 0
+    for line_number, line in enumerate(lines, start=1):
+        if line.strip():
+            if blank_lines_before > 2:
+                result.add(line_number)
+            blank_lines_before = 0
+        else:
+            blank_lines_before += 1
+    return result
 
 
-def check_s004(code_part: str, comment_col: int) -> str | None:
-    if comment_col == -1:
+def parse_class_or_def(stripped: str) -> tuple[str, int, str] | None:
+    """
+    Returns (keyword, spaces_after_keyword, name) when the line (without its
+    leading whitespace) starts a class or function definition, else None.
+    """
+    if stripped.startswith("class"):
+        keyword, pattern = "class", RE_CLASS
+    elif stripped.startswith("def"):
+        keyword, pattern = "def", RE_DEF
+    else:
         return None
 
-    if code_part.strip() == "":
-        return None  # full-line comment
-
-    if not code_part.endswith("  "):
-        return "S004"
-    return None
-
-
-def check_s005(comment_part: str) -> str | None:
-    if comment_part and RE_TODO.search(comment_part):
-        return "S005"
-    return None
-
-
-def check_s006(blank_lines_before: int, raw_line: str) -> str | None:
-    if raw_line.strip() and blank_lines_before > 2:
-        return "S006"
-    return None
+    after = stripped[len(keyword):]
+    if after[:1] == " ":
+        # Usual shape "def name(", "class Name(" or "class Name:": the name
+        # runs up to the first '(' or ':', no regex needed.
+        name = after[1:].partition("(")[0].partition(":")[0]
+        if name.isascii() and name.isidentifier():
+            return keyword, 1, name
+    elif not after[:1].isspace():
+        return None  # e.g. "default = 1" or "classes = []"
+
+    # Extra or unusual whitespace: let the regex sort it out.
+    m = pattern.match(stripped)
+    if m is None:
+        return None
+    return keyword, len(m.group(2)), m.group(3)
 
 
-def check_s007_s008_s009(raw_line: str) -> list[tuple[str, dict]]:
+def check_s007_s008_s009(stripped: str) -> list[tuple[str, dict]]:
     """
     Returns list of (code, format_kwargs) for S007/S008/S009 found on this line.
+    stripped is the line without its leading whitespace.
     """
     results: list[tuple[str, dict]] = []
 
-    m_class = RE_CLASS.match(raw_line)
-    if m_class:
-        spaces = m_class.group(2)
-        name = m_class.group(3)
+    parsed = parse_class_or_def(stripped)
+    if parsed is None:
+        return results
 
-        if len(spaces) > 1:
-            results.append(("S007", {"kw": "class"}))
+    keyword, spaces, name = parsed
+    if spaces > 1:
+        results.append(("S007", {"kw": keyword}))
+    if keyword == "class":
         if not is_camel_case(name):
             results.append(("S008", {"name": name}))
-        return results
-
-    m_def = RE_DEF.match(raw_line)
-    if m_def:
-        spaces = m_def.group(2)
-        name = m_def.group(3)
-
-        if len(spaces) > 1:
-            results.append(("S007", {"kw": "def"}))
-        if not is_snake_case(name):
-            results.append(("S009", {"name": name}))
-        return results
-
+    elif not is_snake_case(name):
+        results.append(("S009", {"name": name}))
     return results
 
 
-def find_issues_for_line(raw_line: str, blank_lines_before: int) -> list[tuple[str, dict]]:
-    code_part, comment_part, comment_col = split_code_and_comment(raw_line)
+def find_issues_for_line(
+    raw_line: str,
+    comment_col: int,
+    in_string: bool = False,
+) -> list[tuple[str, dict]]:
+    """
+    Runs the per-line checks (S003-S005, S007-S009) in one pass, computing
+    each stripped view of the line only once.
+    comment_col comes from scan_source (or line_comment_col); in_string marks
+    a line that ends inside a multi-line string, so its tail is not code.
+    """
+    if comment_col == -1:
+        code_part = raw_line
+        comment_part = ""
+    else:
+        code_part = raw_line[:comment_col]
+        comment_part = raw_line[comment_col:]
+    code = code_part.rstrip()
 
     found: list[tuple[str, dict]] = []
 
-    for code in (
-        check_s001(raw_line),
-        check_s002(raw_line),
-        check_s006(blank_lines_before, raw_line),
-        check_s003(code_part),
-        check_s004(code_part, comment_col),
-        check_s005(comment_part),
-    ):
-        if code is not None:
-            found.append((code, {}))
+    if not in_string and code.endswith(";"):
+        found.append(("S003", {}))
+    if comment_part:
+        # A comment with no code before it is a full-line comment.
+        if code and not code_part.endswith("  "):
+            found.append(("S004", {}))
+        if "todo" in comment_part.casefold():
+            found.append(("S005", {}))
+
+    found.extend(check_s007_s008_s009(raw_line.lstrip()))
 
-    found.extend(check_s007_s008_s009(raw_line))
+    # Each code is appended at most once and in ascending order, so the
+    # result is already unique per code and sorted by code.
+    return found
 
-    # unique by code (only one report per code per line), then sort by code
-    uniq: dict[str, dict] = {}
-    for code, kwargs in found:
-        uniq.setdefault(code, kwargs)
 
-    return sorted(uniq.items(), key=lambda x: x[0])
+# AST node type tuples, built once instead of on every call.
+# Function definitions can only appear inside statements (and the clauses
+# that hold statement bodies), never inside expressions.
+_DEF_CONTAINER_TYPES = (ast.stmt, ast.excepthandler, ast.match_case)
+# Nodes opening a new scope, whose assignments are not the function's own.
+_NESTED_SCOPE_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+_UNPACKING_TARGET_TYPES = (ast.Tuple, ast.List)
+_MUTABLE_DEFAULT_TYPES = (ast.List, ast.Dict, ast.Set)
 
 
-def extract_assigned_names(target: ast.AST) -> list[str]:
-    names: list[str] = []
-    if isinstance(target, ast.Name):
-        names.append(target.id)
-    elif isinstance(target, (ast.Tuple, ast.List)):
-        for elt in target.elts:
-            names.extend(extract_assigned_names(elt))
-    return names
+def extract_assigned_names(target: ast.AST) -> Iterable[str]:
+    stack: list[ast.AST] = [target]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.Name):
+            yield node.id
+        elif isinstance(node, _UNPACKING_TARGET_TYPES):
+            # Reversed so names come out left to right.
+            stack.extend(reversed(node.elts))
 
 
 def walk_without_nested_scopes(nodes: list[ast.stmt]) -> Iterable[ast.AST]:
-    skip_types = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
-    stack: list[ast.AST] = list(reversed(nodes))
+    # Visiting order does not matter: reported items are sorted per file.
+    stack: list[ast.AST] = list(nodes)
     while stack:
         node = stack.pop()
         yield node
-        for child in ast.iter_child_nodes(node):
-            if isinstance(child, skip_types):
-                continue
-            stack.append(child)
+        stack.extend(
+            child
+            for child in ast.iter_child_nodes(node)
+            if not isinstance(child, _NESTED_SCOPE_TYPES)
+        )
 
 
-def analyze_ast_issues(file_path: str) -> list[ReportItem]:
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            source = f.read()
-        tree = ast.parse(source, filename=file_path)
-    except (SyntaxError, OSError, UnicodeDecodeError):
-        return []
+class FunctionIssueVisitor(ast.NodeVisitor):
+    """
+    Collects S010/S011/S012 for every function in a module, descending only
+    into nodes that can hold a function definition.
+    """
 
-    items: list[ReportItem] = []
-    function_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.items: list[ReportItem] = []
 
-    for node in ast.walk(tree):
-        if not isinstance(node, function_types):
-            continue
+    def generic_visit(self, node: ast.AST) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _DEF_CONTAINER_TYPES):
+                self.visit(child)
 
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
         arg_names: list[str] = []
         arg_names.extend(arg.arg for arg in node.args.posonlyargs)
         arg_names.extend(arg.arg for arg in node.args.args)
@@ -220,9 +355,9 @@ def analyze_ast_issues(file_path: str) -> list[ReportItem]:
 
         for arg_name in arg_names:
             if not is_snake_case(arg_name):
-                items.append(
+                self.items.append(
                     ReportItem(
-                        file_path=file_path,
+                        file_path=self.file_path,
                         line_number=node.lineno,
                         code="S010",
                         message=MESSAGES["S010"].format(name=arg_name),
@@ -232,13 +367,13 @@ def analyze_ast_issues(file_path: str) -> list[ReportItem]:
         mutable_default = False
         defaults = list(node.args.defaults) + list(node.args.kw_defaults)
         for default in defaults:
-            if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+            if isinstance(default, _MUTABLE_DEFAULT_TYPES):
                 mutable_default = True
                 break
         if mutable_default:
-            items.append(
+            self.items.append(
                 ReportItem(
-                    file_path=file_path,
+                    file_path=self.file_path,
                     line_number=node.lineno,
                     code="S012",
                     message=MESSAGES["S012"],
@@ -258,16 +393,52 @@ def analyze_ast_issues(file_path: str) -> list[ReportItem]:
             for target in targets:
                 for name in extract_assigned_names(target):
                     if not is_snake_case(name):
-                        items.append(
+                        self.items.append(
                             ReportItem(
-                                file_path=file_path,
+                                file_path=self.file_path,
                                 line_number=inner.lineno,
                                 code="S011",
                                 message=MESSAGES["S011"].format(name=name),
                             )
                         )
 
-    return items
+        self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+
+def analyze_ast_issues(file_path: str, source: str | None = None) -> list[ReportItem]:
+    """
+    Pass the already-read source to avoid reading the file a second time.
+    """
+    try:
+        if source is None:
+            source = read_source(file_path)
+        tree = ast.parse(source, filename=file_path)
+    except (SyntaxError, OSError, UnicodeDecodeError):
+        return []
+
+    visitor = FunctionIssueVisitor(file_path)
+    visitor.visit(tree)
+    return visitor.items
+
+
+def read_source(file_path: str) -> str:
+    """
+    Reads a file like open(file_path, encoding="utf-8").read() does,
+    including universal newlines. Large files are decoded from a memory
+    map of the page cache, skipping the intermediate bytes copy.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            source = f.read().decode("utf-8")
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                source = str(mm, "utf-8")
+
+    if "\r" in source:
+        source = source.replace("\r\n", "\n").replace("\r", "\n")
+    return source
 
 
 def iter_python_files(path: str) -> Iterable[str]:
@@ -276,37 +447,81 @@ def iter_python_files(path: str) -> Iterable[str]:
             yield path
         return
 
-    for root, _dirs, files in os.walk(path):
-        for name in files:
-            if name.endswith(".py"):
-                yield os.path.join(root, name)
+    # Explicit scandir walk: DirEntry caches the file type from readdir, so
+    # no extra stat calls or per-directory name lists are needed.
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Like os.walk, don't descend into symlinked directories.
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".py"):
+                        yield entry.path
+        except OSError:
+            # Unreadable directory: skip it, as os.walk does.
+            continue
 
 
 def analyze_file(file_path: str) -> list[ReportItem]:
+    """
+    Returns all issues found in the file, sorted by line and code.
+    """
     items: list[ReportItem] = []
-    blank_lines_before = 0
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line_number, raw_line in enumerate(f, start=1):
-            issues = find_issues_for_line(raw_line, blank_lines_before)
-            for code, fmt in issues:
-                template = MESSAGES[code]
-                message = template.format(**fmt) if fmt else template
-                items.append(
-                    ReportItem(
-                        file_path=file_path,
-                        line_number=line_number,
-                        code=code,
-                        message=message,
-                    )
+    source = read_source(file_path)
+    comment_col_by_line, string_line_set, scanned_upto = scan_source(source)
+
+    # Split on "\n" only, like iterating the file did; str.splitlines would
+    # also break on form feeds and other separators the tokenizer ignores.
+    lines = source.split("\n")
+    if lines[-1] == "":
+        lines.pop()  # trailing newline, not an extra line
+
+    for code, line_numbers in (
+        ("S001", check_s001(lines)),
+        ("S002", check_s002(lines)),
+        ("S006", check_s006(lines)),
+    ):
+        for line_number in line_numbers:
+            items.append(
+                ReportItem(
+                    file_path=file_path,
+                    line_number=line_number,
+                    code=code,
+                    message=_STATIC_MESSAGES[code],
                 )
+            )
 
-            if raw_line.strip() == "":
-                blank_lines_before += 1
-            else:
-                blank_lines_before = 0
+    for line_number, raw_line in enumerate(lines, start=1):
+        if not raw_line or raw_line.isspace():
+            continue  # blank lines only matter to S006, checked in bulk above
+
+        if line_number <= scanned_upto:
+            comment_col = comment_col_by_line.get(line_number, -1)
+        else:
+            comment_col = line_comment_col(raw_line)
+
+        issues = find_issues_for_line(
+            raw_line,
+            comment_col,
+            line_number in string_line_set,
+        )
+        for code, fmt in issues:
+            message = _STATIC_MESSAGES[code] if not fmt else MESSAGES[code].format(**fmt)
+            items.append(
+                ReportItem(
+                    file_path=file_path,
+                    line_number=line_number,
+                    code=code,
+                    message=message,
+                )
+            )
 
-    items.extend(analyze_ast_issues(file_path))
+    items.extend(analyze_ast_issues(file_path, source))
+    items.sort()
     return items
 
 
@@ -315,13 +530,29 @@ def main() -> None:
         return
 
     input_path = sys.argv[1]
-    all_items: list[ReportItem] = []
-
-    for file_path in sorted(iter_python_files(input_path)):
-        all_items.extend(analyze_file(file_path))
-
-    for item in sorted(all_items):
-        print(f"{item.file_path}: Line {item.line_number}: {item.code} {item.message}")
+    file_paths = sorted(iter_python_files(input_path))
+
+    if len(file_paths) > 1:
+        # Files are independent, so spread them over worker processes. A few
+        # chunks per worker keeps pickling overhead low without leaving
+        # workers idle at the end.
+        chunksize = max(1, len(file_paths) // (4 * (os.cpu_count() or 1)))
+        with ProcessPoolExecutor() as executor:
+            results = list(
+                executor.map(analyze_file, file_paths, chunksize=chunksize)
+            )
+    else:
+        results = [analyze_file(file_path) for file_path in file_paths]
+
+    # Every item of a file shares its file_path, the first sort key, and the
+    # files are visited in sorted order: the per-file sorted lists already
+    # form the globally sorted report when read one after another.
+    lines = [
+        f"{item.file_path}: Line {item.line_number}: {item.code} {item.message}\n"
+        for file_items in results
+        for item in file_items
+    ]
+    sys.stdout.write("".join(lines))
 
 
 if __name__ == "__main__":